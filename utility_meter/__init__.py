@@ -23,6 +23,9 @@ from .const import (
     CONF_TARIFF,
     CONF_TARIFF_ENTITY,
     CONF_TARIFFS,
+    DATA_ACTIVE_SENSOR,
+    DATA_STARTED,
+    DATA_TARIFF_SENSORS,
     DATA_UTILITY,
     DEFAULT,
     DOMAIN,
@@ -72,6 +75,9 @@ async def async_setup(hass, config):
         _LOGGER.debug("Setup %s.%s", DOMAIN, meter)
 
         hass.data[DATA_UTILITY][meter] = conf
+        hass.data[DATA_UTILITY][meter][DATA_TARIFF_SENSORS] = []
+        hass.data[DATA_UTILITY][meter][DATA_STARTED] = False
+        hass.data[DATA_UTILITY][meter][DATA_ACTIVE_SENSOR] = None
 
         if not conf[CONF_TARIFFS]:
             # only one entity is required
@@ -176,7 +182,9 @@ class TariffSelect(RestoreEntity):
     async def async_reset_meters(self):
         """Reset all sensors of this meter."""
         _LOGGER.debug("reset meter %s", self.entity_id)
-        async_dispatcher_send(self.hass, SIGNAL_RESET_METER, self.entity_id)
+        async_dispatcher_send(
+            self.hass, f"{SIGNAL_RESET_METER}_{self.entity_id}", self.entity_id
+        )
 
     async def async_select_tariff(self, tariff):
         """Select new option."""
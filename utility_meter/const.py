@@ -30,6 +30,9 @@ METER_MODES =  [
 ]
 
 DATA_UTILITY = "utility_meter_data"
+DATA_TARIFF_SENSORS = "utility_meter_sensors"
+DATA_STARTED = "utility_meter_started"
+DATA_ACTIVE_SENSOR = "utility_meter_active_sensor"
 
 CONF_METER = "meter"
 CONF_SOURCE_SENSOR = "source"
@@ -1,6 +1,7 @@
 """Utility meter from sensors providing raw data."""
 from datetime import date, timedelta
-from decimal import Decimal, DecimalException
+from decimal import Decimal
+from functools import lru_cache
 import logging
 
 import voluptuous as vol
@@ -9,6 +10,7 @@ from homeassistant.const import (
     ATTR_UNIT_OF_MEASUREMENT,
     CONF_NAME,
     EVENT_HOMEASSISTANT_START,
+    EVENT_HOMEASSISTANT_STOP,
     STATE_UNAVAILABLE,
     STATE_UNKNOWN,
 )
@@ -20,6 +22,7 @@ from homeassistant.helpers.event import (
     async_track_time_change,
 )
 from homeassistant.helpers.restore_state import RestoreEntity
+from homeassistant.helpers.template import is_number
 import homeassistant.util.dt as dt_util
 
 from .const import (
@@ -35,6 +38,9 @@ from .const import (
     CONF_TARIFF,
     CONF_TARIFF_ENTITY,
     DAILY,
+    DATA_ACTIVE_SENSOR,
+    DATA_STARTED,
+    DATA_TARIFF_SENSORS,
     DATA_UTILITY,
     DEFAULT,
     HOURLY,
@@ -60,9 +66,45 @@ ATTR_TARIFF = "tariff"
 ICON = "mdi:counter"
 
 PRECISION = 3
+WRITE_DELAY = 0.1
 PAUSED = "paused"
 COLLECTING = "collecting"
 
+_ZERO = Decimal(0)
+_INVALID_STATES = frozenset({STATE_UNKNOWN, STATE_UNAVAILABLE})
+
+# First day of the current cycle, for cycles longer than a day
+PERIOD_START = {
+    WEEKLY: lambda now: now - timedelta(days=now.weekday()),
+    MONTHLY: lambda now: date(now.year, now.month, 1),
+    BIMONTHLY: lambda now: date(now.year, ((now.month - 1) // 2) * 2 + 1, 1),
+    QUARTERLY: lambda now: date(now.year, ((now.month - 1) // 3) * 3 + 1, 1),
+    YEARLY: lambda now: date(now.year, 1, 1),
+}
+
+
+@lru_cache(maxsize=None)
+def _reset_time_pattern(meter_type, offset_seconds):
+    """Return the (hour, minute, second) pattern at which a cycle resets."""
+    if meter_type == QUARTER_HOURLY:
+        return (
+            None,
+            tuple(
+                (quarter * 15) + offset_seconds % (15 * 60) // 60
+                for quarter in range(4)
+            ),
+            offset_seconds % 60,
+        )
+    if meter_type == HOURLY:
+        return None, offset_seconds // 60, offset_seconds % 60
+    if meter_type in (DAILY, WEEKLY, MONTHLY, BIMONTHLY, QUARTERLY, YEARLY):
+        return (
+            offset_seconds // 3600,
+            offset_seconds % 3600 // 60,
+            offset_seconds % 3600 % 60,
+        )
+    return None
+
 
 async def async_setup_platform(hass, config, async_add_entities, discovery_info=None):
     """Set up the utility meter sensor."""
@@ -84,19 +126,22 @@ async def async_setup_platform(hass, config, async_add_entities, discovery_info=
             CONF_TARIFF_ENTITY
         )
 
-        meters.append(
-            UtilityMeterSensor(
-                conf_meter_source,
-                conf.get(CONF_NAME),
-                conf_meter_type,
-                conf_meter_mode,
-                conf_meter_offset,
-                conf_meter_net_consumption,
-                conf.get(CONF_TARIFF),
-                conf_meter_tariff_entity,
-            )
+        meter_sensor = UtilityMeterSensor(
+            meter,
+            conf_meter_source,
+            conf.get(CONF_NAME),
+            conf_meter_type,
+            conf_meter_mode,
+            conf_meter_offset,
+            conf_meter_net_consumption,
+            conf.get(CONF_TARIFF),
+            conf_meter_tariff_entity,
         )
 
+        meters.append(meter_sensor)
+
+        hass.data[DATA_UTILITY][meter][DATA_TARIFF_SENSORS].append(meter_sensor)
+
     async_add_entities(meters)
 
     platform = entity_platform.current_platform.get()
@@ -111,8 +156,35 @@ async def async_setup_platform(hass, config, async_add_entities, discovery_info=
 class UtilityMeterSensor(RestoreEntity):
     """Representation of an utility meter sensor."""
 
+    _attr_should_poll = False
+    _attr_icon = ICON
+
+    # Entity is not slotted, so instances keep a __dict__ for its attributes
+    __slots__ = (
+        "_parent_meter",
+        "_sensor_source_id",
+        "_state",
+        "_last_period_str",
+        "_last_value",
+        "_last_value_str",
+        "_last_reset",
+        "_collecting",
+        "_name",
+        "_unit_of_measurement",
+        "_mode",
+        "_period_offset",
+        "_period_start",
+        "_reset_pattern",
+        "_sensor_net_consumption",
+        "_tariff",
+        "_tariff_entity",
+        "_write_handle",
+        "_static_attrs",
+    )
+
     def __init__(
         self,
+        parent_meter,
         source_entity,
         name,
         meter_type,
@@ -123,65 +195,108 @@ class UtilityMeterSensor(RestoreEntity):
         tariff_entity=None,
     ):
         """Initialize the Utility Meter sensor."""
+        self._parent_meter = parent_meter
         self._sensor_source_id = source_entity
-        self._state = 0
-        self._last_period = 0
+        self._state = _ZERO
+        self._last_period_str = "0"
         self._last_value = None
+        self._last_value_str = None
         self._last_reset = dt_util.now()
-        self._collecting = None
+        self._collecting = False
         if name:
             self._name = name
         else:
             self._name = f"{source_entity} meter"
         self._unit_of_measurement = None
-        self._period = meter_type
         self._mode = meter_mode
         self._period_offset = meter_offset
+        self._period_start = PERIOD_START.get(meter_type)
+        self._reset_pattern = _reset_time_pattern(meter_type, meter_offset.seconds)
         self._sensor_net_consumption = net_consumption
         self._tariff = tariff
         self._tariff_entity = tariff_entity
+        self._write_handle = None
+
+        # Attributes that never change after init
+        self._static_attrs = {ATTR_SOURCE_ID: source_entity}
+        if meter_type is not None:
+            self._static_attrs[ATTR_PERIOD] = meter_type
+        if tariff is not None:
+            self._static_attrs[ATTR_TARIFF] = tariff
 
     @callback
     def async_reading(self, event):
         """Handle the sensor state changes."""
         old_state = event.data.get("old_state")
         new_state = event.data.get("new_state")
-        if (
-            new_state is None
-            or new_state.state in [STATE_UNKNOWN, STATE_UNAVAILABLE]
-        ):
+        if new_state is None or new_state.state in _INVALID_STATES:
             return
 
         if self._mode == DEFAULT and (
-            old_state is None
-            or old_state.state in [STATE_UNKNOWN, STATE_UNAVAILABLE]
+            old_state is None or old_state.state in _INVALID_STATES
         ):
             return
 
-        self._unit_of_measurement = new_state.attributes.get(ATTR_UNIT_OF_MEASUREMENT)
-
-        try:
-            diff = 0
-            if self._mode == DEFAULT:
-                diff = Decimal(new_state.state) - Decimal(old_state.state)
-            else:
-                if self._last_value is not None:
-                    diff = Decimal(new_state.state) - Decimal(self._last_value)
-                self._last_value = str(new_state.state)
+        unit = new_state.attributes.get(ATTR_UNIT_OF_MEASUREMENT)
+        if (
+            self._mode == DEFAULT
+            and new_state.state == old_state.state
+            and unit == self._unit_of_measurement
+        ):
+            # Nothing to add and nothing to write
+            return
 
-            if (not self._sensor_net_consumption) and diff < 0:
-                # Source sensor just rolled over for unknown reasons,
+        if self._mode == DEFAULT:
+            if not is_number(new_state.state) or not is_number(old_state.state):
+                _LOGGER.warning(
+                    "Invalid state (%s > %s)", old_state.state, new_state.state
+                )
                 return
-            self._state += diff
+        elif not is_number(new_state.state):
+            _LOGGER.warning("Invalid state (%s)", new_state.state)
+            return
+
+        if unit != self._unit_of_measurement:
+            self._unit_of_measurement = unit
 
-        except ValueError as err:
-            _LOGGER.warning("While processing state changes: %s", err)
-        except DecimalException as err:
-            _LOGGER.warning(
-                "Invalid state (%s > %s): %s", old_state.state, new_state.state, err
+        diff = _ZERO
+        new_value = Decimal(new_state.state)
+        if self._mode == DEFAULT:
+            diff = new_value - Decimal(old_state.state)
+        else:
+            if self._last_value is not None:
+                diff = new_value - self._last_value
+            self._last_value = new_value
+            self._last_value_str = new_state.state
+
+        if (not self._sensor_net_consumption) and diff < 0:
+            # Source sensor just rolled over for unknown reasons,
+            return
+        self._state += diff
+
+        self._schedule_write()
+
+    @callback
+    def _schedule_write(self):
+        """Coalesce a burst of readings into a single state write."""
+        if self._write_handle is None:
+            self._write_handle = self.hass.loop.call_later(
+                WRITE_DELAY, self._flush_write
             )
+
+    @callback
+    def _flush_write(self):
+        """Write the state coalesced by _schedule_write."""
+        self._write_handle = None
         self.async_write_ha_state()
 
+    @callback
+    def _async_flush_pending_write(self, event=None):
+        """Write a state still pending from _schedule_write right away."""
+        if self._write_handle is not None:
+            self._write_handle.cancel()
+            self._flush_write()
+
     @callback
     def async_tariff_change(self, event):
         """Handle tariff changes."""
@@ -190,55 +305,53 @@ class UtilityMeterSensor(RestoreEntity):
             return
 
         self._last_value = None
+        self._last_value_str = None
         self._change_status(new_state.state)
 
     def _change_status(self, tariff):
+        meter_data = self.hass.data[DATA_UTILITY][self._parent_meter]
         if self._tariff == tariff:
-            self._collecting = async_track_state_change_event(
-                self.hass, [self._sensor_source_id], self.async_reading
-            )
+            self._collecting = True
+            meter_data[DATA_ACTIVE_SENSOR] = self
         else:
-            if self._collecting:
-                self._collecting()
-            self._collecting = None
+            self._collecting = False
+            if meter_data[DATA_ACTIVE_SENSOR] is self:
+                meter_data[DATA_ACTIVE_SENSOR] = None
 
         _LOGGER.debug(
             "%s - %s - source <%s>",
             self._name,
-            COLLECTING if self._collecting is not None else PAUSED,
+            COLLECTING if self._collecting else PAUSED,
             self._sensor_source_id,
         )
 
         self.async_write_ha_state()
 
     async def _async_reset_meter(self, event):
-        """Determine cycle - Helper function for larger than daily cycles."""
-        now = dt_util.now().date()
-        if (
-            self._period == WEEKLY
-            and now != now - timedelta(days=now.weekday()) + self._period_offset
-        ):
-            return
-        if (
-            self._period == MONTHLY
-            and now != date(now.year, now.month, 1) + self._period_offset
-        ):
-            return
-        if (
-            self._period == BIMONTHLY
-            and now
-            != date(now.year, (((now.month - 1) // 2) * 2 + 1), 1) + self._period_offset
-        ):
-            return
-        if (
-            self._period == QUARTERLY
-            and now
-            != date(now.year, (((now.month - 1) // 3) * 3 + 1), 1) + self._period_offset
-        ):
-            return
-        if self._period == YEARLY and now != date(now.year, 1, 1) + self._period_offset:
+        """Determine cycle, then reset all sensors of the meter."""
+        if self._period_start is not None:
+            now = dt_util.now().date()
+            if now != self._period_start(now) + self._period_offset:
+                return
+        for sensor in self.hass.data[DATA_UTILITY][self._parent_meter][
+            DATA_TARIFF_SENSORS
+        ]:
+            if sensor.hass is not None:
+                await sensor.async_reset_meter(self._tariff_entity)
+
+    @callback
+    def _async_track_reset(self):
+        """Schedule _async_reset_meter on every reset time of the cycle."""
+        if self._reset_pattern is None:
             return
-        await self.async_reset_meter(self._tariff_entity)
+        hour, minute, second = self._reset_pattern
+        async_track_time_change(
+            self.hass,
+            self._async_reset_meter,
+            hour=hour,
+            minute=minute,
+            second=second,
+        )
 
     async def async_reset_meter(self, entity_id):
         """Reset meter."""
@@ -246,9 +359,10 @@ class UtilityMeterSensor(RestoreEntity):
             return
         _LOGGER.debug("Reset utility meter <%s>", self.entity_id)
         self._last_reset = dt_util.now()
-        self._last_period = str(self._state)
+        self._last_period_str = str(self._state)
         self._last_value = None
-        self._state = 0
+        self._last_value_str = None
+        self._state = _ZERO
         self.async_write_ha_state()
 
     async def async_calibrate(self, value):
@@ -256,78 +370,118 @@ class UtilityMeterSensor(RestoreEntity):
         _LOGGER.debug("Calibrate %s = %s", self._name, value)
         self._state = value
         self._last_value = None
+        self._last_value_str = None
         self.async_write_ha_state()
 
     async def async_added_to_hass(self):
         """Handle entity which will be added."""
         await super().async_added_to_hass()
 
-        if self._period == QUARTER_HOURLY:
-            for quarter in range(4):
-                async_track_time_change(
-                    self.hass,
-                    self._async_reset_meter,
-                    minute=(quarter * 15)
-                    + self._period_offset.seconds % (15 * 60) // 60,
-                    second=self._period_offset.seconds % 60,
-                )
-        elif self._period == HOURLY:
-            async_track_time_change(
+        if self._tariff_entity is not None:
+            async_dispatcher_connect(
                 self.hass,
-                self._async_reset_meter,
-                minute=self._period_offset.seconds // 60,
-                second=self._period_offset.seconds % 60,
-            )
-        elif self._period in [DAILY, WEEKLY, MONTHLY, BIMONTHLY, QUARTERLY, YEARLY]:
-            async_track_time_change(
-                self.hass,
-                self._async_reset_meter,
-                hour=self._period_offset.seconds // 3600,
-                minute=self._period_offset.seconds % 3600 // 60,
-                second=self._period_offset.seconds % 3600 % 60,
+                f"{SIGNAL_RESET_METER}_{self._tariff_entity}",
+                self.async_reset_meter,
             )
 
-        async_dispatcher_connect(self.hass, SIGNAL_RESET_METER, self.async_reset_meter)
+        # The restore store is written at stop, so pending readings must land first
+        self.hass.bus.async_listen_once(
+            EVENT_HOMEASSISTANT_STOP, self._async_flush_pending_write
+        )
 
         state = await self.async_get_last_state()
         if state:
-            self._state = Decimal(state.state)
-            self._unit_of_measurement = state.attributes.get(ATTR_UNIT_OF_MEASUREMENT)
-            self._last_period = state.attributes.get(ATTR_LAST_PERIOD)
-            if state.attributes.get(ATTR_LAST_VALUE) is not None:
-                self._last_value = state.attributes.get(ATTR_LAST_VALUE)
-            if state.attributes.get(ATTR_LAST_RESET) is not None:
-                self._last_reset = dt_util.parse_datetime(
-                    state.attributes.get(ATTR_LAST_RESET)
+            attributes = state.attributes
+            if is_number(state.state):
+                self._state = Decimal(state.state)
+            else:
+                _LOGGER.warning(
+                    "Could not restore %s from state %s", self._name, state.state
+                )
+            self._unit_of_measurement = attributes.get(ATTR_UNIT_OF_MEASUREMENT)
+            last_period = attributes.get(ATTR_LAST_PERIOD)
+            if last_period is not None:
+                self._last_period_str = str(last_period)
+            last_value = attributes.get(ATTR_LAST_VALUE)
+            if last_value is not None:
+                if is_number(last_value):
+                    self._last_value_str = str(last_value)
+                    self._last_value = Decimal(self._last_value_str)
+                else:
+                    _LOGGER.warning(
+                        "Could not restore %s last value %s", self._name, last_value
+                    )
+            last_reset = attributes.get(ATTR_LAST_RESET)
+            if isinstance(last_reset, str):
+                self._last_reset = (
+                    dt_util.parse_datetime(last_reset) or self._last_reset
                 )
-            if state.attributes.get(ATTR_STATUS) == COLLECTING:
-                # Fake cancellation function to init the meter in similar state
-                self._collecting = lambda: None
+            if attributes.get(ATTR_STATUS) == COLLECTING:
+                self._collecting = True
+
+        meter_data = self.hass.data[DATA_UTILITY][self._parent_meter]
+        if meter_data[DATA_STARTED]:
+            return
+        meter_data[DATA_STARTED] = True
+
+        # All sensors of a meter share the cycle, so one listener resets them all
+        self._async_track_reset()
 
         @callback
-        def async_source_tracking(event):
-            """Wait for source to be ready, then start meter."""
-            if self._tariff_entity is not None:
-                _LOGGER.debug(
-                    "<%s> tracks utility meter %s", self.name, self._tariff_entity
-                )
-                async_track_state_change_event(
-                    self.hass, [self._tariff_entity], self.async_tariff_change
-                )
+        def async_dispatch_reading(event):
+            """Forward source changes to the collecting sensor of the meter."""
+            sensor = meter_data[DATA_ACTIVE_SENSOR]
+            if sensor is not None:
+                sensor.async_reading(event)
 
-                tariff_entity_state = self.hass.states.get(self._tariff_entity)
-                self._change_status(tariff_entity_state.state)
-                return
+        @callback
+        def async_source_tracking(event):
+            """Wait for source to be ready, then start all sensors of the meter."""
+            for sensor in meter_data[DATA_TARIFF_SENSORS]:
+                if sensor.hass is not None:
+                    sensor.async_start()
 
-            _LOGGER.debug("<%s> collecting from %s", self.name, self._sensor_source_id)
-            self._collecting = async_track_state_change_event(
-                self.hass, [self._sensor_source_id], self.async_reading
+            _LOGGER.debug(
+                "<%s> collecting from %s", self._parent_meter, self._sensor_source_id
+            )
+            async_track_state_change_event(
+                self.hass, [self._sensor_source_id], async_dispatch_reading
             )
 
         self.hass.bus.async_listen_once(
             EVENT_HOMEASSISTANT_START, async_source_tracking
         )
 
+    @callback
+    def async_start(self):
+        """Start tracking the tariff, or collect right away without one."""
+        if self._tariff_entity is not None:
+            _LOGGER.debug(
+                "<%s> tracks utility meter %s", self.name, self._tariff_entity
+            )
+            async_track_state_change_event(
+                self.hass, [self._tariff_entity], self.async_tariff_change
+            )
+
+            tariff_entity_state = self.hass.states.get(self._tariff_entity)
+            self._change_status(tariff_entity_state.state)
+            return
+
+        self._collecting = True
+        self.hass.data[DATA_UTILITY][self._parent_meter][DATA_ACTIVE_SENSOR] = self
+
+    async def async_internal_will_remove_from_hass(self):
+        """Flush a pending state write before the state is saved for restore."""
+        self._async_flush_pending_write()
+        await super().async_internal_will_remove_from_hass()
+
+    async def async_will_remove_from_hass(self):
+        """Stop collecting."""
+        meter_data = self.hass.data[DATA_UTILITY][self._parent_meter]
+        if meter_data[DATA_ACTIVE_SENSOR] is self:
+            meter_data[DATA_ACTIVE_SENSOR] = None
+        await super().async_will_remove_from_hass()
+
     @property
     def name(self):
         """Return the name of the sensor."""
@@ -343,28 +497,13 @@ class UtilityMeterSensor(RestoreEntity):
         """Return the unit the value is expressed in."""
         return self._unit_of_measurement
 
-    @property
-    def should_poll(self):
-        """No polling needed."""
-        return False
-
     @property
     def extra_state_attributes(self):
         """Return the state attributes of the sensor."""
-        state_attr = {
-            ATTR_SOURCE_ID: self._sensor_source_id,
-            ATTR_STATUS: PAUSED if self._collecting is None else COLLECTING,
-            ATTR_LAST_PERIOD: self._last_period,
-            ATTR_LAST_VALUE: self._last_value,
+        return {
+            **self._static_attrs,
+            ATTR_STATUS: COLLECTING if self._collecting else PAUSED,
+            ATTR_LAST_PERIOD: self._last_period_str,
+            ATTR_LAST_VALUE: self._last_value_str,
             ATTR_LAST_RESET: self._last_reset,
-        }
-        if self._period is not None:
-            state_attr[ATTR_PERIOD] = self._period
-        if self._tariff is not None:
-            state_attr[ATTR_TARIFF] = self._tariff
-        return state_attr
-
-    @property
-    def icon(self):
-        """Return the icon to use in the frontend, if any."""
-        return ICON
\ No newline at end of file
+        }
\ No newline at end of file